@@ -1,7 +1,10 @@
+import json
 from datetime import datetime
 from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database.database import get_session
+from app.cache.shared_cache import SharedCache, get_shared_cache
 from app.services.post_service import PostService
 from app.models.models import Post
 from typing import List, Optional, Dict
@@ -42,7 +45,8 @@ async def get_posts(
     keyword: Optional[str] = None,
     limit: int = Query(default=10, ge=1, le=100),
     page: int = Query(default=1, ge=1),
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_session),
+    cache: SharedCache = Depends(get_shared_cache)
 ):
     """
     Получение списка постов с фильтрацией и пагинацией.
@@ -61,31 +65,39 @@ async def get_posts(
     - has_next: есть ли следующая страница
     - has_prev: есть ли предыдущая страница
     """
-    offset = (page - 1) * limit
-    post_service = PostService(session)
-    
-    posts, total = await post_service.filter_posts(
-        category=category,
-        keyword=keyword,
-        limit=limit,
-        offset=offset
-    )
-    
-    total_pages = (total + limit - 1) // limit
-    
-    return PaginatedResponse(
-        items=posts,
-        total=total,
-        page=page,
-        pages=total_pages,
-        has_next=page < total_pages,
-        has_prev=page > 1
-    )
+    async def build_page() -> Dict:
+        offset = (page - 1) * limit
+        post_service = PostService(session)
+        
+        posts, total = await post_service.filter_posts(
+            category=category,
+            keyword=keyword,
+            limit=limit,
+            offset=offset
+        )
+        
+        total_pages = (total + limit - 1) // limit
+        
+        return PaginatedResponse(
+            items=posts,
+            total=total,
+            page=page,
+            pages=total_pages,
+            has_next=page < total_pages,
+            has_prev=page > 1
+        ).model_dump(mode="json")
+
+    # Результат кэшируется общим для всех воркеров кэшем. Страница уже
+    # провалидирована при построении, поэтому отдаем ее без повторной
+    # обработки через response_model
+    cache_key = "posts:" + json.dumps([category, keyword, limit, page], ensure_ascii=False)
+    return JSONResponse(await cache.get_or_set(cache_key, build_page))
 
 @router.post("/posts/{post_id}/process", response_model=ProcessedPostResponse)
 async def process_post(
     post_id: int,
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_session),
+    cache: SharedCache = Depends(get_shared_cache)
 ):
     """
     Обработка поста с анализом текста.
@@ -107,11 +119,14 @@ async def process_post(
         raise HTTPException(status_code=404, detail="Post not found")
     
     processed_post = await post_service.process_post(post)
+    # Списки и статистика содержат результаты обработки, сбрасываем кэш
+    cache.invalidate()
     return processed_post
 
 @router.get("/posts/stats", response_model=Dict)
 async def get_posts_stats(
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_session),
+    cache: SharedCache = Depends(get_shared_cache)
 ):
     """
     Получение статистики по всем постам.
@@ -123,15 +138,4 @@ async def get_posts_stats(
     - Распределение тональности
     """
     post_service = PostService(session)
-    # TODO: Реализовать метод получения статистики
-    # Это можно сделать с помощью агрегирующих запросов
-    return {
-        "total_posts": 0,
-        "processed_posts": 0,
-        "categories": {},
-        "sentiment_distribution": {
-            "positive": 0,
-            "neutral": 0,
-            "negative": 0
-        }
-    }
+    return await cache.get_or_set("posts:stats", post_service.get_stats)
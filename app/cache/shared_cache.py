@@ -0,0 +1,314 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import stat
+import tempfile
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+from dotenv import load_dotenv
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: блокировка между процессами недоступна, остается только
+    # блокировка внутри воркера
+    fcntl = None
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+def default_cache_dir() -> str:
+    """Каталог кэша по умолчанию: отдельный для каждого пользователя и базы данных"""
+    # /dev/shm - tmpfs, общий для всех процессов хоста
+    base_dir = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    user = str(os.getuid()) if hasattr(os, "getuid") else "user"
+    deployment = hashlib.sha256(os.getenv("DATABASE_URL", "").encode()).hexdigest()[:16]
+    return os.path.join(base_dir, f"posts-api-cache-{user}-{deployment}")
+
+class SharedCache:
+    """
+    Кэш результатов, общий для всех воркеров на одном хосте.
+
+    Значения хранятся в виде JSON-файлов в каталоге (в продакшене это tmpfs,
+    например /dev/shm), поэтому каждый воркер видит результаты, посчитанные
+    другими. Если каталог не задан, кэш отключен и всегда вычисляет значение.
+
+    Время истечения записи хранится в mtime файла, что позволяет удалять
+    просроченные записи по stat() без чтения содержимого. Число записей
+    ограничено max_entries: при превышении удаляются ближайшие к истечению.
+
+    Кэш - только оптимизация: ошибки файловой системы (переполненный tmpfs,
+    удаленный каталог) записываются в лог, а значение вычисляется напрямую.
+    """
+    GENERATION_FILE = "generation"
+    LOCK_STRIPES = 64
+    LOCK_POLL_INTERVAL = 0.01
+    STALE_TMP_AGE = 60
+
+    def __init__(
+        self,
+        directory: Optional[str],
+        ttl: int = 30,
+        max_entries: int = 1000,
+        sweep_interval: float = 5
+    ):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.sweep_interval = sweep_interval
+        self._local_locks: Dict[int, asyncio.Lock] = {}
+        self._next_sweep = 0.0
+        self._writes_since_sweep = 0
+        if self.directory:
+            self._prepare_directory()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.directory)
+
+    async def get_or_set(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None
+    ) -> Any:
+        """Возвращает значение из кэша или вычисляет и сохраняет его"""
+        if not self.enabled:
+            return await factory()
+
+        # Путь вычисляется до вызова factory: если во время вычисления
+        # кэш будет сброшен, результат запишется в старое поколение
+        # и не будет виден новым запросам
+        generation = self._generation()
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        path = os.path.join(self.directory, f"{generation}-{digest}.json")
+        hit, value = self._read_entry(path)
+        if hit:
+            return value
+
+        # Вычисляет значение только один запрос на хосте: внутри воркера
+        # остальные ждут на asyncio.Lock, между воркерами - на flock,
+        # после чего читают уже сохраненный результат
+        stripe = int(digest, 16) % self.LOCK_STRIPES
+        async with self._local_lock(stripe), self._host_lock(stripe):
+            hit, value = self._read_entry(path)
+            if hit:
+                return value
+
+            value = await factory()
+            expires_at = time.time() + (self.ttl if ttl is None else ttl)
+            if self._try_write(path, json.dumps(value, ensure_ascii=False), mtime=expires_at):
+                self._writes_since_sweep += 1
+
+        self._sweep_if_due()
+        return value
+
+    def invalidate(self) -> None:
+        """Сбрасывает все записи кэша для всех воркеров"""
+        if not self.enabled:
+            return
+
+        # Записи старого поколения больше не читаются и будут удалены
+        # при следующей плановой очистке
+        self._try_write(
+            os.path.join(self.directory, self.GENERATION_FILE),
+            uuid.uuid4().hex
+        )
+
+    def clear(self) -> None:
+        """Полностью очищает каталог кэша. Вызывается до запуска воркеров"""
+        if not self.enabled:
+            return
+
+        for entry in os.scandir(self.directory):
+            if entry.is_file(follow_symlinks=False):
+                self._unlink(entry.path)
+
+    def _prepare_directory(self) -> None:
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        self._check_directory()
+
+    def _check_directory(self) -> None:
+        # Каталог в общем /dev/shm мог заранее создать другой пользователь,
+        # чтобы подменять ответы API, поэтому проверяем владельца и права
+        st = os.lstat(self.directory)
+        if not stat.S_ISDIR(st.st_mode):
+            raise RuntimeError(f"Путь кэша {self.directory} не является каталогом")
+        if not hasattr(os, "getuid"):
+            return
+        if st.st_uid != os.getuid() or st.st_mode & 0o077:
+            raise RuntimeError(
+                f"Каталог кэша {self.directory} должен принадлежать текущему "
+                f"пользователю и иметь права 0700"
+            )
+
+    def _generation(self) -> str:
+        try:
+            with open(os.path.join(self.directory, self.GENERATION_FILE)) as f:
+                return f.read() or "0"
+        except OSError:
+            return "0"
+
+    def _read_entry(self, path: str) -> Tuple[bool, Any]:
+        try:
+            with open(path, encoding="utf-8") as f:
+                expired = os.fstat(f.fileno()).st_mtime <= time.time()
+                value = None if expired else json.load(f)
+        except FileNotFoundError:
+            return False, None
+        except ValueError:
+            expired = True
+        except OSError as e:
+            logger.warning("Не удалось прочитать запись кэша %s: %s", path, e)
+            return False, None
+
+        if expired:
+            # Просроченные и поврежденные записи удаляем сразу при чтении
+            self._unlink(path)
+            return False, None
+        return True, value
+
+    def _sweep_if_due(self) -> None:
+        # Полный обход каталога дорог, поэтому выполняется не чаще раза
+        # в sweep_interval секунд или после каждой десятой части max_entries записей
+        due_by_writes = self._writes_since_sweep >= max(1, self.max_entries // 10)
+        if not due_by_writes and time.monotonic() < self._next_sweep:
+            return
+
+        self._next_sweep = time.monotonic() + self.sweep_interval
+        self._writes_since_sweep = 0
+        try:
+            self._sweep()
+        except OSError as e:
+            logger.warning("Не удалось очистить каталог кэша %s: %s", self.directory, e)
+
+    def _sweep(self) -> None:
+        """Удаляет просроченные записи, записи старых поколений и брошенные .tmp"""
+        now = time.time()
+        prefix = f"{self._generation()}-"
+        entries = []
+        for entry in os.scandir(self.directory):
+            try:
+                mtime = entry.stat(follow_symlinks=False).st_mtime
+            except FileNotFoundError:
+                continue
+
+            if entry.name.endswith(".tmp"):
+                # Файл, оставшийся от воркера, завершившегося во время записи
+                if now - mtime > self.STALE_TMP_AGE:
+                    self._unlink(entry.path)
+            elif entry.name.endswith(".json"):
+                if not entry.name.startswith(prefix) or mtime <= now:
+                    self._unlink(entry.path)
+                else:
+                    entries.append((mtime, entry.path))
+
+        if len(entries) > self.max_entries:
+            entries.sort()
+            for _, path in entries[:len(entries) - self.max_entries]:
+                self._unlink(path)
+
+    def _local_lock(self, stripe: int) -> asyncio.Lock:
+        if stripe not in self._local_locks:
+            self._local_locks[stripe] = asyncio.Lock()
+        return self._local_locks[stripe]
+
+    @asynccontextmanager
+    async def _host_lock(self, stripe: int) -> AsyncIterator[None]:
+        if fcntl is None:
+            yield
+            return
+
+        try:
+            fd = os.open(
+                os.path.join(self.directory, f"lock-{stripe}"),
+                os.O_CREAT | os.O_RDWR,
+                0o600
+            )
+        except OSError as e:
+            # Без блокировки значение в худшем случае вычислят несколько воркеров
+            logger.warning("Не удалось открыть блокировку кэша %s: %s", self.directory, e)
+            yield
+            return
+
+        try:
+            # Неблокирующие попытки, чтобы не останавливать event loop
+            # и корректно обрабатывать отмену запроса
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    await asyncio.sleep(self.LOCK_POLL_INTERVAL)
+            try:
+                yield
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+    def _try_write(self, path: str, data: str, mtime: Optional[float] = None) -> bool:
+        try:
+            if not os.path.isdir(self.directory):
+                # Каталог удален, например, при очистке /dev/shm
+                self._prepare_directory()
+            self._write_text(path, data, mtime=mtime)
+            return True
+        except (OSError, RuntimeError) as e:
+            logger.warning("Не удалось записать в кэш %s: %s", self.directory, e)
+            return False
+
+    def _write_text(self, path: str, data: str, mtime: Optional[float] = None) -> None:
+        # Атомарная запись: другие воркеры никогда не увидят файл частично
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+            if mtime is not None:
+                os.utime(tmp_path, (mtime, mtime))
+            os.replace(tmp_path, path)
+        except BaseException:
+            self._unlink(tmp_path)
+            raise
+
+    def _unlink(self, path: str) -> None:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+_shared_cache: Optional[SharedCache] = None
+
+def get_shared_cache() -> SharedCache:
+    """
+    Общий кэш текущего процесса. Создается при первом обращении, чтобы
+    учитывать SHARED_CACHE_DIR, заданный run.py уже после импорта модуля.
+    """
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = SharedCache(
+            os.getenv("SHARED_CACHE_DIR"),
+            ttl=int(os.getenv("SHARED_CACHE_TTL", "30")),
+            max_entries=int(os.getenv("SHARED_CACHE_MAX_ENTRIES", "1000"))
+        )
+    return _shared_cache
+
+def invalidate_host_cache() -> None:
+    """
+    Сбрасывает кэш сервера, запущенного на этом хосте.
+    Используется скриптами, изменяющими данные в обход API: данные
+    к этому моменту уже записаны, поэтому ошибки только выводятся в лог.
+    """
+    directory = os.getenv("SHARED_CACHE_DIR") or default_cache_dir()
+    if not os.path.isdir(directory):
+        return
+
+    try:
+        SharedCache(directory).invalidate()
+    except (OSError, RuntimeError) as e:
+        logger.warning("Не удалось сбросить кэш %s: %s", directory, e)
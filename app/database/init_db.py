@@ -1,5 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.models import Post
+from app.cache.shared_cache import invalidate_host_cache
 import asyncio
 
 async def create_test_data(session: AsyncSession):
@@ -31,6 +32,8 @@ async def create_test_data(session: AsyncSession):
         session.add(post)
     
     await session.commit()
+    # Данные изменены в обход API, сбрасываем кэш запущенного сервера
+    invalidate_host_cache()
 
 if __name__ == "__main__":
     # Этот код можно запустить отдельно для создания тестовых данных
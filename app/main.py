@@ -5,13 +5,17 @@ from app.models.models import Base
 from app.database.database import engine
 from contextlib import asynccontextmanager
 from typing import Dict
+import os
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Setup
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
-        await conn.run_sync(Base.metadata.create_all)
+    # В продакшене схему один раз создает run.py до запуска воркеров,
+    # иначе каждый воркер пересоздавал бы таблицы при старте
+    if os.getenv("APP_ENV") != "production":
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
     yield
     # Cleanup
     await engine.dispose()
@@ -114,3 +114,32 @@ class PostService:
         elif neg_count > pos_count:
             return -1
         return 0
+
+    async def get_stats(self) -> Dict:
+        """Агрегированная статистика по всем постам"""
+        total_posts = await self.session.scalar(select(func.count(Post.id)))
+        processed_posts = await self.session.scalar(select(func.count(ProcessedPost.id)))
+
+        # Количество постов по категориям
+        categories_result = await self.session.execute(
+            select(Post.category, func.count(Post.id)).group_by(Post.category)
+        )
+        categories = {category: count for category, count in categories_result.all()}
+
+        # Распределение тональности среди обработанных постов
+        sentiment_result = await self.session.execute(
+            select(ProcessedPost.sentiment_score, func.count(ProcessedPost.id))
+            .group_by(ProcessedPost.sentiment_score)
+        )
+        sentiment_counts = dict(sentiment_result.all())
+
+        return {
+            "total_posts": total_posts,
+            "processed_posts": processed_posts,
+            "categories": categories,
+            "sentiment_distribution": {
+                "positive": sentiment_counts.get(1, 0),
+                "neutral": sentiment_counts.get(0, 0),
+                "negative": sentiment_counts.get(-1, 0)
+            }
+        }
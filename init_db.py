@@ -1,5 +1,6 @@
 import asyncio
 from app.database.database import async_session, engine
+from app.cache.shared_cache import invalidate_host_cache
 from app.models.models import Base, Post
 
 async def init_db():
@@ -41,5 +42,8 @@ async def init_db():
         await session.commit()
         print("База данных успешно инициализирована тестовыми данными!")
 
+    # Данные изменены в обход API, сбрасываем кэш запущенного сервера
+    invalidate_host_cache()
+
 if __name__ == "__main__":
     asyncio.run(init_db())
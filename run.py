@@ -1,4 +1,70 @@
+import argparse
+import asyncio
+import os
 import uvicorn
+from dotenv import load_dotenv
+
+# .env загружается до чтения APP_ENV и SHARED_CACHE_DIR, чтобы run.py
+# и воркеры видели одинаковые настройки
+load_dotenv()
+
+def default_workers() -> int:
+    # Учитываем только ядра, доступные процессу (контейнеры, taskset)
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError("должно быть не меньше 1")
+    return number
+
+async def create_schema():
+    from app.database.database import engine
+    from app.models.models import Base
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await engine.dispose()
+
+def run_production(host: str, port: int, workers: int):
+    from app.cache.shared_cache import SharedCache, default_cache_dir
+
+    # Переменные задаются до создания кэша: при workers=1 uvicorn запускает
+    # приложение в этом же процессе
+    os.environ["APP_ENV"] = "production"
+    os.environ.setdefault("SHARED_CACHE_DIR", default_cache_dir())
+    # Кэш переживает перезапуск сервера, поэтому очищаем его до старта воркеров
+    SharedCache(os.environ["SHARED_CACHE_DIR"]).clear()
+    asyncio.run(create_schema())
+
+    uvicorn.run(
+        "app.main:app",
+        host=host,
+        port=port,
+        workers=workers,
+        # uvloop и httptools используются, если установлены
+        loop="auto",
+        http="auto",
+        # Дожидаемся завершения текущих запросов (в т.ч. process_post)
+        timeout_graceful_shutdown=int(os.getenv("GRACEFUL_SHUTDOWN_TIMEOUT", "30")),
+    )
 
 if __name__ == "__main__":
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
+    parser = argparse.ArgumentParser(description="Запуск Posts API")
+    parser.add_argument("--prod", action="store_true", help="продакшен-режим с несколькими воркерами")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        default=os.getenv("WEB_CONCURRENCY", str(default_workers())),
+        help="количество воркеров (по умолчанию - число доступных ядер)"
+    )
+    args = parser.parse_args()
+
+    if args.prod or os.getenv("APP_ENV") == "production":
+        run_production(args.host, args.port, args.workers)
+    else:
+        uvicorn.run("app.main:app", host=args.host, port=args.port, reload=True)
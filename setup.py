@@ -14,4 +14,7 @@ setup(
         "pytest-asyncio",
         "httpx"
     ],
+    extras_require={
+        "production": ["uvicorn[standard]"],
+    },
 )
@@ -8,6 +8,7 @@ from sqlalchemy.orm import close_all_sessions
 from sqlalchemy.sql import text
 from app.models.models import Base
 from app.database.database import get_session
+from app.cache.shared_cache import SharedCache, get_shared_cache
 from app.main import app
 import asyncio
 import logging
@@ -45,6 +46,14 @@ async def setup_database() -> AsyncGenerator[None, None]:
     yield
     await test_engine.dispose()
 
+@pytest.fixture(autouse=True)
+def disable_shared_cache() -> Generator[None, None, None]:
+    # Кэш, включенный через .env, пережил бы пересоздание БД между тестами.
+    # Тесты кэша подменяют зависимость сами
+    app.dependency_overrides[get_shared_cache] = lambda: SharedCache(None)
+    yield
+    app.dependency_overrides.pop(get_shared_cache, None)
+
 @pytest_asyncio.fixture
 async def test_session() -> AsyncGenerator[AsyncSession, None]:
     async with test_async_session() as session:
@@ -1,7 +1,10 @@
 import pytest
 from httpx import AsyncClient
 from app.models.models import Post
+from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
+from app import main
+from app.cache.shared_cache import SharedCache, get_shared_cache
 
 @pytest.mark.asyncio
 async def test_health_check(client: AsyncClient):
@@ -121,3 +124,84 @@ async def test_process_post(client: AsyncClient, test_session: AsyncSession):
     assert "word_frequency" in data
     assert "extracted_tags" in data
     assert "sentiment_score" in data
+
+@pytest.mark.asyncio
+async def test_posts_served_from_shared_cache(
+    client: AsyncClient,
+    test_session: AsyncSession,
+    tmp_path
+):
+    cache = SharedCache(str(tmp_path / "cache"))
+    main.app.dependency_overrides[get_shared_cache] = lambda: cache
+
+    test_post = Post(category="Test", content="Cached post")
+    test_session.add(test_post)
+    await test_session.commit()
+
+    response = await client.get("/api/posts/")
+    assert response.status_code == 200
+    assert response.json()["total"] == 1
+
+    # Пост добавлен в обход API, поэтому ответ берется из кэша
+    test_session.add(Post(category="Test", content="Not cached yet"))
+    await test_session.commit()
+
+    response = await client.get("/api/posts/")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 1
+    assert data["items"][0]["processed"] is None
+
+    # Обработка поста сбрасывает кэш
+    response = await client.post(f"/api/posts/{test_post.id}/process")
+    assert response.status_code == 200
+
+    # В тестах сессия общая для всех запросов, в приложении - своя на каждый
+    test_session.expire_all()
+    response = await client.get("/api/posts/")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 2
+    processed = {item["id"]: item["processed"] for item in data["items"]}
+    assert processed[test_post.id]["post_id"] == test_post.id
+
+@pytest.mark.asyncio
+async def test_posts_stats(client: AsyncClient, test_session: AsyncSession):
+    posts = [
+        Post(category="Tech", content="Это отлично"),
+        Post(category="Tech", content="Это плохо"),
+        Post(category="News", content="Обычные новости")
+    ]
+    for post in posts:
+        test_session.add(post)
+    await test_session.commit()
+
+    for post in posts[:2]:
+        response = await client.post(f"/api/posts/{post.id}/process")
+        assert response.status_code == 200
+
+    response = await client.get("/api/posts/stats")
+    assert response.status_code == 200
+    assert response.json() == {
+        "total_posts": 3,
+        "processed_posts": 2,
+        "categories": {"Tech": 2, "News": 1},
+        "sentiment_distribution": {
+            "positive": 1,
+            "neutral": 0,
+            "negative": 1
+        }
+    }
+
+@pytest.mark.asyncio
+async def test_lifespan_keeps_data_in_production(test_session: AsyncSession, monkeypatch):
+    test_session.add(Post(category="Test", content="Persistent post"))
+    await test_session.commit()
+
+    monkeypatch.setenv("APP_ENV", "production")
+    monkeypatch.setattr(main, "engine", test_session.bind)
+    async with main.lifespan(main.app):
+        pass
+
+    total = await test_session.scalar(select(func.count(Post.id)))
+    assert total == 1
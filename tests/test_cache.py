@@ -0,0 +1,203 @@
+import asyncio
+import os
+import shutil
+import time
+import pytest
+from app.cache import shared_cache as shared_cache_module
+from app.cache.shared_cache import SharedCache, invalidate_host_cache
+
+@pytest.mark.asyncio
+async def test_shared_cache_is_shared_between_instances(tmp_path):
+    calls = []
+
+    async def factory():
+        calls.append(1)
+        return {"total": len(calls)}
+
+    # Два экземпляра с одним каталогом имитируют два воркера
+    first_worker = SharedCache(str(tmp_path))
+    second_worker = SharedCache(str(tmp_path))
+
+    assert await first_worker.get_or_set("posts", factory) == {"total": 1}
+    assert await second_worker.get_or_set("posts", factory) == {"total": 1}
+    assert len(calls) == 1
+
+@pytest.mark.asyncio
+async def test_shared_cache_invalidate(tmp_path):
+    cache = SharedCache(str(tmp_path))
+    values = iter([1, 2])
+
+    async def factory():
+        return next(values)
+
+    assert await cache.get_or_set("stats", factory) == 1
+    cache.invalidate()
+    assert await cache.get_or_set("stats", factory) == 2
+
+@pytest.mark.asyncio
+async def test_shared_cache_expired_entry(tmp_path):
+    cache = SharedCache(str(tmp_path), ttl=0)
+    values = iter([1, 2])
+
+    async def factory():
+        return next(values)
+
+    assert await cache.get_or_set("stats", factory) == 1
+    assert await cache.get_or_set("stats", factory) == 2
+
+@pytest.mark.asyncio
+async def test_shared_cache_disabled():
+    cache = SharedCache(None)
+    values = iter([1, 2])
+
+    async def factory():
+        return next(values)
+
+    assert await cache.get_or_set("stats", factory) == 1
+    assert await cache.get_or_set("stats", factory) == 2
+
+@pytest.mark.asyncio
+async def test_shared_cache_evicts_expired_entries(tmp_path):
+    cache = SharedCache(str(tmp_path / "cache"), ttl=0, sweep_interval=0)
+
+    async def factory():
+        return 1
+
+    for i in range(50):
+        await cache.get_or_set(f"posts:{i}", factory)
+
+    entries = list((tmp_path / "cache").glob("*.json"))
+    assert len(entries) <= 1
+
+@pytest.mark.asyncio
+async def test_shared_cache_max_entries(tmp_path):
+    cache = SharedCache(str(tmp_path / "cache"), max_entries=5)
+
+    async def factory():
+        return 1
+
+    for i in range(20):
+        await cache.get_or_set(f"posts:{i}", factory)
+
+    assert len(list((tmp_path / "cache").glob("*.json"))) == 5
+
+@pytest.mark.asyncio
+async def test_shared_cache_evicts_foreign_entries(tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache = SharedCache(str(cache_dir))
+
+    # Запись старого поколения и файл, брошенный воркером во время записи
+    foreign_entry = cache_dir / "old-generation.json"
+    foreign_entry.write_text("1")
+    os.utime(foreign_entry, (time.time() + 60, time.time() + 60))
+    stale_tmp = cache_dir / "abandoned.tmp"
+    stale_tmp.write_text("{")
+    os.utime(stale_tmp, (time.time() - 3600, time.time() - 3600))
+
+    async def factory():
+        return 1
+
+    await cache.get_or_set("posts", factory)
+
+    assert not foreign_entry.exists()
+    assert not stale_tmp.exists()
+    assert len(list(cache_dir.glob("*.json"))) == 1
+
+@pytest.mark.asyncio
+async def test_shared_cache_single_flight(tmp_path):
+    calls = []
+
+    async def factory():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return len(calls)
+
+    # Одновременные промахи в двух "воркерах" вычисляют значение один раз
+    workers = [SharedCache(str(tmp_path / "cache")) for _ in range(2)]
+    results = await asyncio.gather(*[
+        workers[i % 2].get_or_set("posts", factory) for i in range(10)
+    ])
+
+    assert results == [1] * 10
+    assert len(calls) == 1
+
+def test_shared_cache_rejects_insecure_directory(tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir(mode=0o777)
+    os.chmod(cache_dir, 0o777)
+
+    with pytest.raises(RuntimeError):
+        SharedCache(str(cache_dir))
+
+def test_shared_cache_clear(tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache = SharedCache(str(cache_dir))
+    (cache_dir / "generation").write_text("stale")
+    (cache_dir / "0-entry.json").write_text("1")
+
+    cache.clear()
+
+    assert list(cache_dir.iterdir()) == []
+
+@pytest.mark.asyncio
+async def test_shared_cache_sweep_is_throttled(tmp_path, monkeypatch):
+    cache = SharedCache(str(tmp_path / "cache"), max_entries=1000)
+    sweeps = []
+    monkeypatch.setattr(cache, "_sweep", lambda: sweeps.append(1))
+
+    async def factory():
+        return 1
+
+    for i in range(20):
+        await cache.get_or_set(f"posts:{i}", factory)
+
+    # Первая запись выполняет очистку, следующие - только по расписанию
+    assert len(sweeps) == 1
+
+@pytest.mark.asyncio
+async def test_shared_cache_survives_removed_directory(tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache = SharedCache(str(cache_dir))
+    shutil.rmtree(cache_dir)
+
+    async def factory():
+        return 1
+
+    # Ошибки кэша не должны ломать запросы
+    cache.invalidate()
+    assert await cache.get_or_set("posts", factory) == 1
+    assert cache_dir.is_dir()
+
+@pytest.mark.asyncio
+async def test_shared_cache_falls_back_on_write_error(tmp_path, monkeypatch):
+    cache = SharedCache(str(tmp_path / "cache"))
+
+    def write_text(*args, **kwargs):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(cache, "_write_text", write_text)
+
+    async def factory():
+        return 1
+
+    cache.invalidate()
+    assert await cache.get_or_set("posts", factory) == 1
+
+def test_invalidate_host_cache_does_not_raise(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    os.chmod(cache_dir, 0o777)
+    monkeypatch.setenv("SHARED_CACHE_DIR", str(cache_dir))
+
+    invalidate_host_cache()
+
+    assert not (cache_dir / "generation").exists()
+
+def test_get_shared_cache_reads_environment_lazily(tmp_path, monkeypatch):
+    monkeypatch.setattr(shared_cache_module, "_shared_cache", None)
+    monkeypatch.setenv("SHARED_CACHE_DIR", str(tmp_path / "cache"))
+
+    cache = shared_cache_module.get_shared_cache()
+
+    assert cache.enabled
+    assert cache is shared_cache_module.get_shared_cache()
@@ -0,0 +1,65 @@
+import argparse
+import os
+import pytest
+import run
+from app.cache import shared_cache as shared_cache_module
+
+def test_run_production(monkeypatch, tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir(mode=0o700)
+    (cache_dir / "0-stale.json").write_text("1")
+
+    calls = {}
+
+    async def create_schema():
+        calls["schema"] = True
+
+    def uvicorn_run(app, **kwargs):
+        calls["app"] = app
+        calls["kwargs"] = kwargs
+
+    monkeypatch.setenv("APP_ENV", "development")
+    monkeypatch.setenv("SHARED_CACHE_DIR", str(cache_dir))
+    monkeypatch.setattr(run, "create_schema", create_schema)
+    monkeypatch.setattr(run.uvicorn, "run", uvicorn_run)
+
+    run.run_production("127.0.0.1", 8000, workers=4)
+
+    assert os.environ["APP_ENV"] == "production"
+    assert calls["schema"]
+    assert calls["app"] == "app.main:app"
+    assert calls["kwargs"]["workers"] == 4
+    assert calls["kwargs"]["loop"] == "auto"
+    assert calls["kwargs"]["http"] == "auto"
+    assert calls["kwargs"]["timeout_graceful_shutdown"] == 30
+    assert "reload" not in calls["kwargs"]
+    # Кэш прошлого запуска очищен до старта воркеров
+    assert list(cache_dir.iterdir()) == []
+
+def test_run_production_single_worker_enables_cache(monkeypatch, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    calls = {}
+
+    async def create_schema():
+        pass
+
+    def uvicorn_run(app, **kwargs):
+        # При workers=1 приложение работает в этом же процессе
+        calls["cache"] = shared_cache_module.get_shared_cache()
+
+    monkeypatch.setenv("APP_ENV", "development")
+    monkeypatch.delenv("SHARED_CACHE_DIR", raising=False)
+    monkeypatch.setattr(shared_cache_module, "_shared_cache", None)
+    monkeypatch.setattr(shared_cache_module, "default_cache_dir", lambda: cache_dir)
+    monkeypatch.setattr(run, "create_schema", create_schema)
+    monkeypatch.setattr(run.uvicorn, "run", uvicorn_run)
+
+    run.run_production("127.0.0.1", 8000, workers=1)
+
+    assert calls["cache"].enabled
+    assert calls["cache"].directory == cache_dir
+
+def test_workers_must_be_positive():
+    assert run.positive_int("2") == 2
+    with pytest.raises(argparse.ArgumentTypeError):
+        run.positive_int("0")